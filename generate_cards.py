@@ -1,21 +1,23 @@
 # ================================================================
-#  HITSTER CARD GENERATOR  –  One‑Track‑Playlist version
+#  HITSTER CARD GENERATOR  –  Web Playback SDK version
 #  ---------------------------------------------------------------
-#  Creates private 1‑track playlists so the embed shows square art
-#  (no banner). Generates HTML stubs, QR codes, and a printable PDF.
+#  Cards play spotify:track: URIs through the SDK (no playlists needed).
+#  Generates HTML stubs, QR codes, and a printable PDF.
 # ================================================================
 
 # ---------- SECTION 0 : Imports ----------
 from dotenv import load_dotenv
 load_dotenv()
 
-import os, json
+import os, sys
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 import qrcode
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))   # shared helpers: scripts/card_text.py
+from card_text import wrap_lines
 
 # ---------- SECTION 1 : Credentials ----------
 CLIENT_ID     = os.getenv("SPOTIPY_CLIENT_ID")
@@ -23,16 +25,15 @@ CLIENT_SECRET = os.getenv("SPOTIPY_CLIENT_SECRET")
 REDIRECT_URI  = os.getenv("SPOTIPY_REDIRECT_URI")       # http://127.0.0.1:8080/callback
 
 # ---------- SECTION 2 : Spotify User‑Auth ----------
-scope = "playlist-modify-private"
+scope = None                                    # track lookups only; no playlist writes
 sp = spotipy.Spotify(auth_manager=SpotifyOAuth(
         client_id=CLIENT_ID,
         client_secret=CLIENT_SECRET,
         redirect_uri=REDIRECT_URI,
         scope=scope))
-USER_ID = sp.current_user()['id']
 
-# ---------- SECTION 3 : Track → Playlist cache ----------
-# removed the need to create playlists by going to SDK mode
+# ---------- SECTION 3 : Track → Playlist cache (removed) ----------
+# SDK mode plays track URIs directly, so no per-track playlist or cache
 
 BASE_URL   = "https://skywisej.github.io/qr-music-card-maker/cards/html/"   # <-- moved higher in program
 # ---------- SECTION 4 : Deck settings ----------
@@ -65,8 +66,10 @@ COLS, ROWS      = 3, 4
 CARD_W, CARD_H  = 60*mm, 60*mm            # tweak size here
 X_START, Y_START = 15*mm, 15*mm           # page margin
 
-pdf_front = canvas.Canvas("deck_front.pdf", pagesize=letter)
-pdf_back  = canvas.Canvas("deck_back.pdf",  pagesize=letter)
+template_text = TEMPLATE_HTML.read_text(encoding="utf-8")   # read once, reused per track
+
+pdf_front = canvas.Canvas("deck_front.pdf", pagesize=letter, pageCompression=1)
+pdf_back  = canvas.Canvas("deck_back.pdf",  pagesize=letter, pageCompression=1)
 
 cells_filled = 0
 for idx, track in enumerate(tracks, start=1):
@@ -81,8 +84,7 @@ for idx, track in enumerate(tracks, start=1):
 
     # 1. create HTML stub from template
     html_name = f"track{idx}.html"
-    with open(TEMPLATE_HTML, "r", encoding="utf-8") as tpl:
-        html_stub = tpl.read().replace("SPOTIFY_TRACK_URI", track_uri)
+    html_stub = template_text.replace("SPOTIFY_TRACK_URI", track_uri)
     with open(f"cards/html/{html_name}", "w", encoding="utf-8") as fh:
         fh.write(html_stub)
 
@@ -110,16 +112,14 @@ for idx, track in enumerate(tracks, start=1):
 
     # ---- BACK SHEET (mirror LEFT‑RIGHT, centered date top-half + wrapped title/artist) ----
     from reportlab.pdfbase.pdfmetrics import stringWidth
-    import textwrap
 
     # compute the left edge of this mirrored card
     mirror_x = letter[0] - x - CARD_W        # flip horizontally
     y_back   = y - Y_SHIFT                   # apply duplex correction
     pdf_back.rect(mirror_x, y_back, CARD_W, CARD_H, stroke=1, fill=0)    # draw the card border
 
-    # helper to center text by measuring its width
+    # helper to center text by measuring its width (caller sets the font)
     def draw_centered(text, py, font_name, font_size):
-        pdf_back.setFont(font_name, font_size)
         text_w = stringWidth(text, font_name, font_size)
         px = mirror_x + (CARD_W - text_w) / 2
         pdf_back.drawString(px, py, text)
@@ -137,6 +137,7 @@ for idx, track in enumerate(tracks, start=1):
     # 1. date center in top half
     date_font, date_size = "Helvetica-Bold", 45
     date_y = y_back + CARD_H * 0.5 # halfway between top and midline
+    pdf_back.setFont(date_font, date_size)
     draw_centered(year, date_y, date_font, date_size)
 
     #vertical baseline for the block below date
@@ -146,24 +147,11 @@ for idx, track in enumerate(tracks, start=1):
     title_font, title_size = "Helvetica-Bold", 12
     max_width = CARD_W - 10*mm  # allow 5 mm margin each side
     
-    # wrap on word boundaries to fit the max_width
-    wrapped = textwrap.wrap(title, 
-        width=100,  # a rough character count; we'll filter by actual width next
-    )
-    # refine by actual string width
-    lines = []
-    for line in wrapped:
-        if stringWidth(line, title_font, title_size) <= max_width:
-            lines.append(line)
-        else:
-            # further break very long single words
-            words = textwrap.wrap(line, width=int(len(line) * max_width / stringWidth(line, title_font, title_size)))
-            lines.extend(words)
-
-    # take at most 2 lines
-    lines = lines[:2]
+    # greedy word wrap by actual string width, at most 2 lines
+    lines = wrap_lines(title, title_font, title_size, max_width, max_lines=2)
 
     # draw each title line
+    pdf_back.setFont(title_font, title_size)
     for i, txt in enumerate(lines):
         py = block_top - i * (title_size + TITLE_LINE_SPACING)
         draw_centered(txt, py, title_font, title_size)
@@ -171,6 +159,7 @@ for idx, track in enumerate(tracks, start=1):
     # 3. ARTIST — below the title lines
     artist_font, artist_size = "Helvetica", 10
     artist_y = block_top - len(lines) * (title_size + TITLE_LINE_SPACING) - ARTIST_GAP
+    pdf_back.setFont(artist_font, artist_size)
     draw_centered(artist, artist_y, artist_font, artist_size)
 
     cells_filled += 1
@@ -182,7 +171,10 @@ for idx, track in enumerate(tracks, start=1):
 pdf_front.save()
 pdf_back.save()
 # --- Combine front & back into one duplex‑ready PDF ---
-from PyPDF2 import PdfReader, PdfWriter
+try:
+    from pypdf import PdfReader, PdfWriter       # maintained successor to PyPDF2
+except ImportError:
+    from PyPDF2 import PdfReader, PdfWriter
 
 out = PdfWriter()
 front_pages = PdfReader("deck_front.pdf").pages
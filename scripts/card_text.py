@@ -0,0 +1,50 @@
+# ================================================================
+# Card text layout helpers (shared by the deck generators)
+# - Width measurement with cached per-font ASCII tables
+# - Greedy single-pass word wrap for the card backs
+# ================================================================
+
+import functools
+from typing import List, Tuple
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+@functools.lru_cache(maxsize=None)
+def _ascii_widths(font: str, size: float) -> Tuple[float, ...]:
+    # Per-char advance widths for codes 0-127, measured once per (font, size)
+    return tuple(stringWidth(chr(i), font, size) for i in range(128))
+
+def text_width(text: str, font: str, size: float) -> float:
+    # Table lookup for ASCII (no kerning in the base-14 fonts, so sums match);
+    # anything else goes through reportlab's encoder
+    if text.isascii():
+        widths = _ascii_widths(font, size)
+        return sum(widths[ord(c)] for c in text)
+    return stringWidth(text, font, size)
+
+@functools.lru_cache(maxsize=4096)
+def line_width(text: str, font: str, size: float) -> float:
+    # Memoized for centering: years and short lines repeat across a deck
+    return text_width(text, font, size)
+
+@functools.lru_cache(maxsize=2048)
+def _wrap(text: str, font: str, size: float, max_width: float, max_lines: int) -> Tuple[str, ...]:
+    # Greedy word wrap using precomputed character widths
+    words = text.split()
+    lines = []
+    cur = ""
+    for w in words:
+        trial = (cur + " " + w).strip()
+        if text_width(trial, font, size) <= max_width or not cur:
+            cur = trial
+        else:
+            lines.append(cur)
+            cur = w
+    if cur:
+        lines.append(cur)
+    return tuple(lines[:max_lines])  # cap (3 by default) for neat backs
+
+def wrap_lines(text: str, font: str, size: float, max_width: float, max_lines: int = 3) -> List[str]:
+    # Memoized: artists (and the odd title) repeat across a deck.
+    # max_width is rounded so float noise doesn't split cache entries.
+    return list(_wrap(text or "", font, size, round(max_width, 3), max_lines))
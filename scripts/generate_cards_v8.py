@@ -4,14 +4,16 @@
 # - Reads tracks from CSV and/or Spotify playlists
 # - Fills metadata (title, artist, year) from Spotify if missing
 # - Generates per-track HTML from a template with SPOTIFY_TRACK_URI
-# - Builds front/back printable PDF with mirrored backs
+# - Builds a duplex printable PDF (fronts interleaved with mirrored backs)
 # ================================================================
 
-import os, sys, csv, re, argparse, math
+import os, sys, io, csv, re, json, hashlib, argparse, math
+import asyncio
+import concurrent.futures
 from dotenv import load_dotenv
 load_dotenv()
 from pathlib import Path
-from typing import List, Dict, Any, Iterable
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
 from dataclasses import dataclass
 
 # Optional Spotify (only needed for playlist fetch or metadata fill)
@@ -21,13 +23,23 @@ try:
 except Exception:
     spotipy = None
 
+# Optional aiohttp (concurrent playlist paging; falls back to sequential spotipy calls)
+try:
+    import aiohttp
+except Exception:
+    aiohttp = None
+
 # Images / PDF
 import qrcode
+from qrcode.image.pure import PyPNGImage
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import mm
-from reportlab.pdfbase.pdfmetrics import stringWidth
-from PyPDF2 import PdfReader, PdfWriter
+from reportlab.lib.utils import ImageReader
+
+# Shared text helpers live next to this script (scripts/card_text.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from card_text import line_width, wrap_lines
 
 # ---------------- Config Defaults ----------------
 DEFAULT_TEMPLATE = Path("card-template-v7.html")  # or card-template-v7.1-debug.html while testing
@@ -35,6 +47,7 @@ DEFAULT_VERSION  = "v7.2"
 DEFAULT_BASE_URL = ""  # e.g. "https://yourname.github.io/qr-music-card-maker/cards/html/"
 DEFAULT_HTML_DIR = Path("cards/html")
 DEFAULT_QR_DIR   = Path("cards/qrcodes")
+QR_INDEX_NAME    = ".index.json"  # sidecar in qr dir: png name -> [url, key] it was encoded with
 DEFAULT_CSV      = Path("data/tracks.csv")
 
 # Card layout (Letter portrait, 4 x 2 grid, 60 mm squares by default)
@@ -51,6 +64,33 @@ TITLE_FONT_SZ = 9.0
 ARTIST_FONT_SZ= 8.5
 YEAR_FONT_SZ  = 22
 
+# Per-cell anchors, indexed by position on the page (row-major), computed once.
+# Front: (x, y, x_qr, y_qr); back: (mirror_x, y_back, year_baseline, title_top)
+QR_SIZE = CARD_W - 20*mm
+
+def _cell_anchors(i: int) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    row, col = divmod(i, COLS)
+    x = X_START + col * CARD_W
+    y = letter[1] - Y_START - (row + 1) * CARD_H
+    mirror_x = letter[0] - x - CARD_W
+    y_back   = y - Y_SHIFT
+    return ((x, y, x + (CARD_W - QR_SIZE) / 2, y + (CARD_H - QR_SIZE) / 2),
+            (mirror_x, y_back, y_back + CARD_H - 18*mm, y_back + CARD_H/2 + 6*mm))
+
+FRONT_ANCHORS, BACK_ANCHORS = map(list, zip(*(_cell_anchors(i) for i in range(COLS * ROWS))))
+
+QR_ERROR_CORRECTION = qrcode.constants.ERROR_CORRECT_M
+QR_BOX_SIZE = 10
+QR_BORDER   = 4   # modules of quiet zone (QR spec minimum)
+QR_PARALLEL_MIN = 32     # fewer QRs to encode than this -> skip the process pool
+QR_ENCODER  = "pypng-1"  # bump when make_qr_png output changes in a way the settings above don't capture
+
+# Spotify paging
+SPOTIFY_API      = "https://api.spotify.com/v1"
+PAGE_SIZE        = 100  # max items per playlist_items page
+PAGE_CONCURRENCY = 8    # in-flight page requests; keeps us under rate limits
+PAGE_RETRIES     = 5
+
 # ---------------- Data Model ----------------
 @dataclass
 class Track:
@@ -65,39 +105,35 @@ class Track:
 # ---------------- Utilities ----------------
 SPOTIFY_TRACK_ID_RE = re.compile(r"(?:spotify:track:|open\.spotify\.com/track/)?([A-Za-z0-9]{22})")
 
+YEAR_RE = re.compile(r"\s*(\d{4})")
+
 def norm_track_uri(s: str) -> str:
     s = s.strip()
+    # fast path: bare 22-char track id
+    if len(s) == 22 and s.isascii() and s.isalnum():
+        return "spotify:track:" + s
     m = SPOTIFY_TRACK_ID_RE.search(s)
     if not m:
         return ""
     return "spotify:track:" + m.group(1)
 
 def parse_year(release_date: str) -> str:
-    rel = (release_date or "").strip()
-    if not rel:
+    if not release_date:
         return ""
     # release_date can be YYYY, YYYY-MM, or YYYY-MM-DD
-    return rel.split("-")[0]
+    m = YEAR_RE.match(release_date)
+    return m.group(1) if m else ""
 
 def ensure_dirs(*paths: Iterable[Path]):
     for p in paths:
         p.mkdir(parents=True, exist_ok=True)
 
-def wrap_lines(text: str, font: str, size: float, max_width: float) -> List[str]:
-    # Simple word wrap using reportlab width measurement
-    words = (text or "").split()
-    lines = []
-    cur = ""
-    for w in words:
-        trial = (cur + " " + w).strip()
-        if stringWidth(trial, font, size) <= max_width or not cur:
-            cur = trial
-        else:
-            lines.append(cur)
-            cur = w
-    if cur:
-        lines.append(cur)
-    return lines[:3]  # cap at 3 lines for neat backs
+def write_if_changed(path: Path, data: bytes) -> bool:
+    # Skip the write (and the mtime bump) when the file already holds these bytes
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.write_bytes(data)
+    return True
 
 # ---------------- Spotify helpers ----------------
 def make_sp_client() -> Any:
@@ -118,7 +154,57 @@ def make_sp_client() -> Any:
         )
     )
 
-def fetch_playlist_tracks(sp: Any, playlist: str, limit: int | None = None) -> List[Track]:
+async def _fetch_page(session: Any, sem: asyncio.Semaphore, pid: str, offset: int) -> Dict[str, Any]:
+    url = f"{SPOTIFY_API}/playlists/{pid}/tracks"
+    params = {"offset": offset, "limit": PAGE_SIZE, "additional_types": "track"}
+    delay = 1.0
+    async with sem:
+        for _ in range(PAGE_RETRIES):
+            async with session.get(url, params=params) as resp:
+                if resp.status != 429 and resp.status < 500:
+                    resp.raise_for_status()
+                    return await resp.json()
+                # rate limited / server error: honour Retry-After, else exponential backoff
+                wait = float(resp.headers.get("Retry-After", delay))
+            await asyncio.sleep(wait)
+            delay *= 2
+    raise RuntimeError(f"Spotify API: gave up on playlist {pid} offset {offset} after {PAGE_RETRIES} tries")
+
+async def _fetch_pages_async(token: str, pid: str, offsets: Iterable[int]) -> List[Dict[str, Any]]:
+    sem = asyncio.Semaphore(PAGE_CONCURRENCY)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with aiohttp.ClientSession(headers=headers) as session:
+        return await asyncio.gather(*[_fetch_page(session, sem, pid, o) for o in offsets])
+
+def _playlist_pages(sp: Any, pid: str, limit: int | None = None) -> Iterator[Dict[str, Any]]:
+    # First page synchronously to learn `total`, then the rest concurrently
+    # (yielded in order). Without a limit every remaining page is gathered in
+    # one session under the semaphore; with one, pages are requested in
+    # waves sized to what could still be needed, and the caller stops
+    # iterating once it has enough tracks.
+    first = sp.playlist_items(pid, offset=0, limit=PAGE_SIZE, additional_types=("track",))
+    yield first
+    total = first.get("total") or 0
+    offsets = range(PAGE_SIZE, total, PAGE_SIZE)
+    if not offsets:
+        return
+    if aiohttp is None:
+        for o in offsets:
+            yield sp.playlist_items(pid, offset=o, limit=PAGE_SIZE, additional_types=("track",))
+        return
+    token = sp.auth_manager.get_access_token(as_dict=False)
+    if not limit:
+        yield from asyncio.run(_fetch_pages_async(token, pid, offsets))
+        return
+    offset = PAGE_SIZE
+    while offset < total:
+        # every item fetched so far may have been kept, so this is a lower bound
+        pages = min(PAGE_CONCURRENCY, max(1, math.ceil((limit - offset) / PAGE_SIZE)))
+        wave = range(offset, min(offset + pages * PAGE_SIZE, total), PAGE_SIZE)
+        offset = wave[-1] + PAGE_SIZE
+        yield from asyncio.run(_fetch_pages_async(token, pid, wave))
+
+def fetch_playlist_tracks(sp: Any, playlist: str, limit: int | None = None, seen: set | None = None) -> List[Track]:
     uri = norm_track_uri(playlist.replace("playlist:", "track:"))  # normalize; we'll handle playlist via API
     # Actually parse playlist id separately
     m = re.search(r"(?:spotify:playlist:|open\.spotify\.com/playlist/)([A-Za-z0-9]{22})", playlist)
@@ -127,15 +213,11 @@ def fetch_playlist_tracks(sp: Any, playlist: str, limit: int | None = None) -> L
     pid = m.group(1)
 
     out: List[Track] = []
-    seen = set()
-    offset = 0
-    got = 1
-    while got:
-        page = sp.playlist_items(pid, offset=offset, additional_types=("track",))
-        items = page.get("items", [])
-        got = len(items)
-        offset += got
-        for it in items:
+    # pass a shared set to dedupe across several playlists in one run
+    if seen is None:
+        seen = set()
+    for page in _playlist_pages(sp, pid, limit):
+        for it in page.get("items", []):
             tr = it.get("track") or {}
             if not tr or tr.get("id") is None:
                 continue
@@ -158,146 +240,251 @@ def fetch_playlist_tracks(sp: Any, playlist: str, limit: int | None = None) -> L
             ))
             if limit and len(out) >= limit:
                 return out
-        if not page.get("next"):
-            break
     return out
 
 def fill_missing_from_spotify(sp: Any, tracks: List[Track]) -> None:
     # batch lookup where year/title/artist missing
-    need_ids = [t.uri.split(":")[-1] for t in tracks if not (t.title and t.artist and t.year)]
+    # (dedupe ids first so repeated tracks cost one lookup, order preserved)
+    need_ids = list(dict.fromkeys(t.uri.split(":")[-1] for t in tracks if not (t.title and t.artist and t.year)))
+    info: Dict[str, Dict[str, Any]] = {}
     for i in range(0, len(need_ids), 50):
         batch = need_ids[i:i+50]
         if not batch: 
             continue
         res = sp.tracks(batch).get("tracks", [])
-        info = {tr["id"]: tr for tr in res if tr}
-        for t in tracks:
-            tid = t.uri.split(":")[-1]
-            if tid in info:
-                tr = info[tid]
-                if not t.title:  t.title = tr.get("name","")
-                if not t.artist: t.artist= ", ".join(a["name"] for a in (tr.get("artists") or []))
-                if not t.year:
-                    rel = (tr.get("album") or {}).get("release_date","")
-                    t.year = parse_year(rel) or ""
-                if not t.album:
-                    t.album = (tr.get("album") or {}).get("name","")
-                if not t.release_date:
-                    t.release_date = (tr.get("album") or {}).get("release_date","")
-                t.explicit = bool(tr.get("explicit", False))
+        info.update({tr["id"]: tr for tr in res if tr})
+    # single pass over tracks once every batch is in
+    for t in tracks:
+        tid = t.uri.split(":")[-1]
+        if tid in info:
+            tr = info[tid]
+            if not t.title:  t.title = tr.get("name","")
+            if not t.artist: t.artist= ", ".join(a["name"] for a in (tr.get("artists") or []))
+            if not t.year:
+                rel = (tr.get("album") or {}).get("release_date","")
+                t.year = parse_year(rel) or ""
+            if not t.album:
+                t.album = (tr.get("album") or {}).get("name","")
+            if not t.release_date:
+                t.release_date = (tr.get("album") or {}).get("release_date","")
+            t.explicit = bool(tr.get("explicit", False))
 
 # ---------------- CSV helpers ----------------
 CSV_HEADER = ["uri","title","artist","year","album","release_date","explicit"]
 
+def _cell(row: List[str], i: int | None) -> str:
+    # short rows and absent columns read as "" (extra trailing cells are ignored)
+    return row[i] if i is not None and i < len(row) else ""
+
 def read_csv(path: Path) -> List[Track]:
     if not path.exists(): 
         return []
     rows = []
     with path.open("r", newline="", encoding="utf-8") as f:
-        r = csv.DictReader(f)
+        r = csv.reader(f)
+        header = next(r, None)
+        if not header:
+            return []
+        # column positions looked up once; absent columns are None and read as ""
+        i_uri, i_title, i_artist, i_year, i_album, i_rel, i_expl = (
+            header.index(name) if name in header else None for name in CSV_HEADER)
         for row in r:
-            uri = norm_track_uri(row.get("uri",""))
+            uri = _cell(row, i_uri)
+            if not uri:
+                continue
+            uri = norm_track_uri(uri)
             if not uri:
                 continue
             rows.append(Track(
                 uri=uri,
-                title=row.get("title",""),
-                artist=row.get("artist",""),
-                year=row.get("year",""),
-                album=row.get("album",""),
-                release_date=row.get("release_date",""),
-                explicit=(str(row.get("explicit","")).lower() in ("1","true","yes"))
+                title=_cell(row, i_title),
+                artist=_cell(row, i_artist),
+                year=_cell(row, i_year),
+                album=_cell(row, i_album),
+                release_date=_cell(row, i_rel),
+                explicit=(_cell(row, i_expl).lower() in ("1","true","yes"))
             ))
     return rows
 
 def write_csv(path: Path, tracks: List[Track]):
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=CSV_HEADER)
-        w.writeheader()
-        for t in tracks:
-            w.writerow(dict(
-                uri=t.uri,
-                title=t.title,
-                artist=t.artist,
-                year=t.year,
-                album=t.album,
-                release_date=t.release_date,
-                explicit=("true" if t.explicit else "false")
-            ))
+        w = csv.writer(f)
+        w.writerow(CSV_HEADER)
+        w.writerows(
+            (t.uri, t.title, t.artist, t.year, t.album, t.release_date,
+             "true" if t.explicit else "false")
+            for t in tracks
+        )
 
 # ---------------- HTML & QR ----------------
-def build_card_html(template_text: str, track_uri: str) -> str:
-    return template_text.replace("SPOTIFY_TRACK_URI", track_uri)
-
-def generate_assets(tracks: List[Track], template_path: Path, base_url: str, version_tag: str, html_dir: Path, qr_dir: Path) -> List[str]:
-    template = template_path.read_text(encoding="utf-8")
+TRACK_URI_PLACEHOLDER = b"SPOTIFY_TRACK_URI"
+
+def split_template(template_text: str) -> List[bytes]:
+    # Encode + split once per run; each card is then a single bytes join
+    return template_text.encode("utf-8").split(TRACK_URI_PLACEHOLDER)
+
+def build_card_html(template_parts: List[bytes], track_uri: str) -> bytes:
+    return track_uri.encode("ascii").join(template_parts)
+
+def card_url(html_name: str, base_url: str, version_tag: str) -> str:
+    # QR points to hosted URL if base_url given; otherwise relative path
+    url = f"{base_url}{html_name}" if base_url else html_name
+    # always add cache buster
+    if "?" in url: 
+        return f"{url}&v={version_tag}"
+    return f"{url}?v={version_tag}"
+
+def qr_key(url: str, version: int) -> str:
+    # Cache key for a QR PNG: the URL plus every encoder setting that shapes the bytes
+    spec = f"{QR_ENCODER}|v{version}|ec{QR_ERROR_CORRECTION}|box{QR_BOX_SIZE}|border{QR_BORDER}|{url}"
+    return hashlib.blake2b(spec.encode("utf-8"), digest_size=16).hexdigest()
+
+QR_PNG_RE = re.compile(r"track\d+\.png")
+
+def load_qr_index(qr_dir: Path) -> Dict[str, List[str]]:
+    path = qr_dir / QR_INDEX_NAME
+    if not path.exists():
+        return {}
+    try:
+        index = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+    return index if isinstance(index, dict) else {}
+
+def save_qr_index(qr_dir: Path, index: Dict[str, List[str]]):
+    # Only call once every PNG it lists is on disk: the index is what marks
+    # a trackNNNN.png as holding a given URL
+    write_if_changed(qr_dir / QR_INDEX_NAME,
+                     json.dumps(index, indent=2, sort_keys=True).encode("utf-8"))
+
+def fit_qr_version(url: str) -> int:
+    # Smallest QR version that holds `url`; probed once per deck with the longest URL
+    qr = qrcode.QRCode(error_correction=QR_ERROR_CORRECTION)
+    qr.add_data(url)
+    qr.make(fit=True)
+    return qr.version
+
+def make_qr_png(url: str, version: int) -> bytes:
+    # Fixed version skips the fit search; PyPNG writes a 1-bit PNG without PIL
+    qr = qrcode.QRCode(version=version, error_correction=QR_ERROR_CORRECTION,
+                       box_size=QR_BOX_SIZE, border=QR_BORDER, image_factory=PyPNGImage)
+    qr.add_data(url)
+    qr.make(fit=False)
+    buf = io.BytesIO()
+    qr.make_image().save(buf)
+    return buf.getvalue()
+
+def render_one(args) -> Tuple[str, bytes | None]:
+    # Worker for generate_assets: writes one HTML stub and encodes its QR.
+    # Returns (html name, PNG bytes) -- bytes are None when the PNG is already cached.
+    # Top-level (picklable) so it can run in a ProcessPoolExecutor.
+    idx, uri, template_parts, url, qr_version, qr_cached, html_dir = args
+    html_name = f"track{idx:04}.html"
+    write_if_changed(html_dir / html_name, build_card_html(template_parts, uri))
+    if qr_cached:
+        return html_name, None
+    return html_name, make_qr_png(url, qr_version)
+
+def write_qr_pngs(qr_pngs: Dict[Path, bytes]):
+    # Persist freshly encoded QRs for hosting; runs after the PDF is built
+    with concurrent.futures.ThreadPoolExecutor() as ex:
+        list(ex.map(lambda item: item[0].write_bytes(item[1]), qr_pngs.items()))
+
+def generate_assets(tracks: List[Track], template_path: Path, base_url: str, version_tag: str, html_dir: Path, qr_dir: Path) -> Tuple[List[str], List[Path], Dict[Path, bytes], Dict[str, List[str]]]:
+    template = split_template(template_path.read_text(encoding="utf-8"))
     ensure_dirs(html_dir, qr_dir)
 
-    html_names: List[str] = []
-    for idx, t in enumerate(tracks, start=1):
-        html_name = f"track{idx:04}.html"
-        html_path = html_dir / html_name
-        html = build_card_html(template, t.uri)
-        html_path.write_text(html, encoding="utf-8")
-        # QR points to hosted URL if base_url given; otherwise relative path
-        url = f"{base_url}{html_name}" if base_url else html_name
-        # always add cache buster
-        if "?" in url: 
-            url = f"{url}&v={version_tag}"
-        else:
-            url = f"{url}?v={version_tag}"
-        qr_img = qrcode.make(url)
-        qr_path = qr_dir / (html_name.replace(".html",".png"))
-        qr_img.save(qr_path)
-        html_names.append(html_name)
-    return html_names
+    urls = [card_url(f"track{idx:04}.html", base_url, version_tag)
+            for idx in range(1, len(tracks) + 1)]
+    qr_version = fit_qr_version(max(urls, key=len)) if urls else 1
+
+    # A PNG is reused only if the index says it was written for this exact URL
+    # with the current encoder settings
+    old_index = load_qr_index(qr_dir)
+    index: Dict[str, List[str]] = {}
+    arglist = []
+    qr_paths: List[Path] = []
+    to_encode = 0
+    for idx, url in enumerate(urls, start=1):
+        png_name = f"track{idx:04}.png"
+        entry = [url, qr_key(url, qr_version)]
+        index[png_name] = entry
+        qr_path = qr_dir / png_name
+        qr_paths.append(qr_path)
+        qr_cached = old_index.get(png_name) == entry and qr_path.exists()
+        to_encode += not qr_cached
+        arglist.append((idx, tracks[idx - 1].uri, template, url, qr_version, qr_cached, html_dir))
+
+    # PNGs from a previous, larger deck are no longer referenced
+    for png_name in old_index.keys() - index.keys():
+        if QR_PNG_RE.fullmatch(png_name):
+            (qr_dir / png_name).unlink(missing_ok=True)
+
+    # QR encode is CPU-bound and independent per track -> fan out
+    # across cores; ex.map keeps results in track order. Small decks (or
+    # mostly-cached ones) aren't worth the process start-up cost.
+    if to_encode < QR_PARALLEL_MIN:
+        results = list(map(render_one, arglist))
+    else:
+        with concurrent.futures.ProcessPoolExecutor() as ex:
+            results = list(ex.map(render_one, arglist, chunksize=8))
+    html_names: List[str] = [name for name, _ in results]
+    # new QRs stay in memory for the PDF; see write_qr_pngs. The index is
+    # returned, not saved, so it only lands after those PNGs are written.
+    qr_pngs = {path: png for path, (_, png) in zip(qr_paths, results) if png is not None}
+    return html_names, qr_paths, qr_pngs, index
 
 # ---------------- PDF building ----------------
-def build_pdfs(tracks: List[Track], html_names: List[str]):
-    # Front and Back PDFs
-    front = canvas.Canvas("deck_front.pdf", pagesize=letter)
-    back  = canvas.Canvas("deck_back.pdf",  pagesize=letter)
+def load_qr_image(qr_path: Path, png: bytes | None) -> ImageReader:
+    # fresh QRs come straight from memory; cached ones from disk
+    return ImageReader(io.BytesIO(png) if png is not None else str(qr_path))
+
+def layout_back(title: str, artist: str) -> Tuple[List[str], List[str]]:
+    maxw = CARD_W - 12*mm
+    return (wrap_lines(title or "", BACK_FONT, TITLE_FONT_SZ, maxw),
+            wrap_lines(artist or "", BACK_FONT, ARTIST_FONT_SZ, maxw))
+
+def build_pdfs(tracks: List[Track], qr_paths: List[Path], qr_pngs: Dict[Path, bytes]):
+    # One duplex PDF: each front page is followed directly by its mirrored back
+    pdf = canvas.Canvas("deck_duplex.pdf", pagesize=letter, pageCompression=1)
 
     cells_per_page = COLS * ROWS
     page_count = math.ceil(len(tracks) / cells_per_page)
 
-    def draw_front_cell(pdf, ix, col, row, qr_path):
-        x = X_START + col * CARD_W
-        y = letter[1] - Y_START - (row + 1) * CARD_H
-        S = CARD_W - 20*mm
-        x_qr = x + (CARD_W - S) / 2
-        y_qr = y + (CARD_H - S) / 2
-        pdf.drawImage(str(qr_path), x_qr, y_qr, width=S, height=S)
+    # Wrap every back up front; drawing then only places the lines
+    back_layouts = [layout_back(t.title, t.artist) for t in tracks]
+
+
+    def draw_front_cell(pdf, i, qr_path):
+        x, y, x_qr, y_qr = FRONT_ANCHORS[i]
+        # per-draw reader: nothing decoded outlives its card
+        pdf.drawImage(load_qr_image(qr_path, qr_pngs.get(qr_path)), x_qr, y_qr, width=QR_SIZE, height=QR_SIZE)
         pdf.rect(x, y, CARD_W, CARD_H, stroke=1, fill=0)
 
-    def draw_back_cell(pdf, ix, col, row, title, artist, year):
-        x = X_START + col * CARD_W
-        y = letter[1] - Y_START - (row + 1) * CARD_H
-        mirror_x = letter[0] - x - CARD_W
-        y_back   = y - Y_SHIFT
+    def draw_back_cell(pdf, i, title_lines, artist_lines, year):
+        mirror_x, y_back, year_y, title_y = BACK_ANCHORS[i]
         pdf.rect(mirror_x, y_back, CARD_W, CARD_H, stroke=1, fill=0)
 
         # Year centered near top
         year_txt = (year or "")
         pdf.setFont(BACK_FONT, YEAR_FONT_SZ)
-        w = stringWidth(year_txt, BACK_FONT, YEAR_FONT_SZ)
-        pdf.drawString(mirror_x + (CARD_W - w)/2, y_back + CARD_H - 18*mm, year_txt)
-
-        # Title (wrap)
-        maxw = CARD_W - 12*mm
-        py = y_back + CARD_H/2 + 6*mm
-        for line in wrap_lines(title or "", BACK_FONT, TITLE_FONT_SZ, maxw):
-            w = stringWidth(line, BACK_FONT, TITLE_FONT_SZ)
-            pdf.setFont(BACK_FONT, TITLE_FONT_SZ)
+        w = line_width(year_txt, BACK_FONT, YEAR_FONT_SZ)
+        pdf.drawString(mirror_x + (CARD_W - w)/2, year_y, year_txt)
+
+        # Title (wrapped in layout_back)
+        py = title_y
+        pdf.setFont(BACK_FONT, TITLE_FONT_SZ)
+        for line in title_lines:
+            w = line_width(line, BACK_FONT, TITLE_FONT_SZ)
             pdf.drawString(mirror_x + (CARD_W - w)/2, py, line)
             py -= 4.2*mm
 
-        # Artist (wrap)
+        # Artist (wrapped in layout_back)
         py -= 2.5*mm
-        for line in wrap_lines(artist or "", BACK_FONT, ARTIST_FONT_SZ, maxw):
-            w = stringWidth(line, BACK_FONT, ARTIST_FONT_SZ)
-            pdf.setFont(BACK_FONT, ARTIST_FONT_SZ)
+        pdf.setFont(BACK_FONT, ARTIST_FONT_SZ)
+        for line in artist_lines:
+            w = line_width(line, BACK_FONT, ARTIST_FONT_SZ)
             pdf.drawString(mirror_x + (CARD_W - w)/2, py, line)
             py -= 4.0*mm
 
@@ -308,31 +495,16 @@ def build_pdfs(tracks: List[Track], html_names: List[str]):
         subset = tracks[start:end]
         # Fronts
         for i, t in enumerate(subset):
-            col = i % COLS
-            row = i // COLS
-            qr_path = Path("cards/qrcodes") / (f"track{start + i + 1:04}.png")
-            draw_front_cell(front, start+i, col, row, qr_path)
-        front.showPage()
+            draw_front_cell(pdf, i, qr_paths[start + i])
+        pdf.showPage()
 
         # Backs
         for i, t in enumerate(subset):
-            col = i % COLS
-            row = i // COLS
-            draw_back_cell(back, start+i, col, row, t.title, t.artist, t.year)
-        back.showPage()
-
-    front.save()
-    back.save()
-
-    # Interleave into deck_duplex.pdf
-    out = PdfWriter()
-    fpages = PdfReader("deck_front.pdf").pages
-    bpages = PdfReader("deck_back.pdf").pages
-    for fp, bp in zip(fpages, bpages):
-        out.add_page(fp)
-        out.add_page(bp)
-    with open("deck_duplex.pdf", "wb") as fh:
-        out.write(fh)
+            title_lines, artist_lines = back_layouts[start + i]
+            draw_back_cell(pdf, i, title_lines, artist_lines, t.year)
+        pdf.showPage()
+
+    pdf.save()
     print("Created deck_duplex.pdf – front/back interleaved")
 
 # ---------------- Main ----------------
@@ -358,8 +530,11 @@ def main():
             print("spotipy is required for playlist import. pip install spotipy python-dotenv")
             sys.exit(2)
         sp = make_sp_client()
+        # shared across playlists so a track in several lists is only imported once
+        # (CSV vs playlist duplicates are left to --dedupe)
+        seen_ids = set()
         for pl in args.playlists:
-            fetched = fetch_playlist_tracks(sp, pl, limit=args.limit)
+            fetched = fetch_playlist_tracks(sp, pl, limit=args.limit, seen=seen_ids)
             print(f"Imported {len(fetched)} tracks from {pl}")
             tracks.extend(fetched)
 
@@ -396,8 +571,10 @@ def main():
         print(f"Wrote {len(tracks)} tracks to {args.csv}")
 
     # Generate HTML + QR + PDFs
-    html_names = generate_assets(tracks, args.template, args.base_url, args.version, DEFAULT_HTML_DIR, DEFAULT_QR_DIR)
-    build_pdfs(tracks, html_names)
+    html_names, qr_paths, qr_pngs, qr_index = generate_assets(tracks, args.template, args.base_url, args.version, DEFAULT_HTML_DIR, DEFAULT_QR_DIR)
+    build_pdfs(tracks, qr_paths, qr_pngs)
+    write_qr_pngs(qr_pngs)
+    save_qr_index(DEFAULT_QR_DIR, qr_index)
     print(f"Created {len(html_names)} card HTML files in {DEFAULT_HTML_DIR} and QR PNGs in {DEFAULT_QR_DIR}")
 
 if __name__ == "__main__":